@@ -3,22 +3,78 @@ import sys
 sys.stdout.reconfigure(line_buffering=True)
 sys.stderr.reconfigure(line_buffering=True)
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Log through a queue: emitting a record just enqueues it, and the
+# formatting + stdout write happen on the listener thread - request and
+# fetcher threads never serialize on the stdout lock. Configured before
+# price_fetcher is imported so its import-time logging is captured too.
+_log_queue = queue.Queue(-1)
+# Plain message format - the messages carry their own [ERROR]/[ALERT]
+# tags, matching what the Docker logs have always looked like
+logging.basicConfig(level=logging.INFO, format='%(message)s',
+                    handlers=[QueueHandler(_log_queue)])
+QueueListener(_log_queue, logging.StreamHandler(sys.stdout)).start()
+logger = logging.getLogger(__name__)
+
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, Response, g, has_request_context, stream_with_context
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+import orjson
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import event, func, case
+from sqlalchemy.engine import Engine, RowMapping
+from sqlalchemy.pool import NullPool
+import re
+import sqlite3
+from datetime import datetime, timezone
 import threading
 import time
-import traceback
 from price_fetcher import price_fetcher
+from apscheduler.schedulers.background import BackgroundScheduler
 import os
+import shutil
+from pathlib import Path
+from PIL import Image, ImageOps
 from werkzeug.utils import secure_filename
 import uuid
-from functools import wraps
+import hashlib
+import operator
+from functools import wraps, lru_cache
 
 # Disable __pycache__ creation (only works if set before Python starts - use run.sh)
 os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
 
+# orjson (C extension) in place of stdlib json - every jsonify call
+# serializes the big list-of-dicts responses several times faster.
+# No OPT_SORT_KEYS and no indent option: output stays compact and in
+# insertion order (Flask's stdlib provider could sort/pretty-print;
+# neither is wanted on a 15-field dict per coin row).
+def _json_default(obj):
+    """Let orjson serialize SQLAlchemy row mappings directly, so Core
+    query results can be passed through without a per-row dict rebuild"""
+    if isinstance(obj, RowMapping):
+        return dict(obj)
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Compress responses over 1 KiB (JSON bodies shrink 5-10x); brotli when
+# the client supports it, gzip otherwise. Streaming responses (SSE,
+# NDJSON) have no length and are skipped automatically.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
 
 # Secret key for sessions (from environment variable or default for dev)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-key-change-in-production')
@@ -34,18 +90,66 @@ os.makedirs(data_dir, exist_ok=True)
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(data_dir, "database.db")}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# File upload configuration
+# Local SQLite doesn't benefit from a connection pool sized for a
+# networked database: open a fresh connection per checkout so no idle
+# pooled connection holds a read transaction that blocks WAL
+# checkpoints. Opening a SQLite connection is microseconds.
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'poolclass': NullPool,
+    'connect_args': {'check_same_thread': False, 'timeout': 30},
+}
+
+# Cache static files for a year - asset URLs carry a content hash (see
+# static_url below) and uploaded images use unique UUID filenames, so a
+# changed file always gets a new URL and stale caches are impossible
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+
+@lru_cache(maxsize=None)
+def _static_file_hash(filename):
+    """Short content hash of a static file, computed once per process"""
+    path = os.path.join(basedir, 'static', filename)
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()[:8]
+    except OSError:
+        return '0'
+
+@app.template_global()
+def static_url(filename):
+    """url_for('static', ...) with a content-hash cache buster"""
+    return url_for('static', filename=filename, v=_static_file_hash(filename))
+
+# File upload configuration (paths built once, not per request)
 UPLOAD_FOLDER = os.path.join(basedir, 'static', 'images')
+UPLOAD_ROOT = Path(UPLOAD_FOLDER)
+CATEGORY_DIRS = {c: UPLOAD_ROOT / c for c in ('metals', 'coins', 'goldbacks')}
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-# No max file size limit
+# Cap request size so a runaway upload can't exhaust disk or memory
+app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32 MiB
 
 # Create upload directories if they don't exist
-for category in ['metals', 'coins', 'goldbacks']:
-    os.makedirs(os.path.join(UPLOAD_FOLDER, category), exist_ok=True)
+for category_dir in CATEGORY_DIRS.values():
+    category_dir.mkdir(parents=True, exist_ok=True)
 
 db = SQLAlchemy(app)
 
+# SQLite tuning, applied once per connection: WAL lets dashboard reads
+# proceed during writes, synchronous=NORMAL cuts fsync cost per commit,
+# busy_timeout rides out short lock contention instead of erroring
+@event.listens_for(Engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _):
+    if not isinstance(dbapi_conn, sqlite3.Connection):
+        return  # Only applies to SQLite
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA busy_timeout=5000")
+    cur.execute("PRAGMA cache_size=-20000")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA foreign_keys=ON")
+    cur.close()
+
 # Login required decorator
 def login_required(f):
     @wraps(f)
@@ -92,52 +196,170 @@ def format_percent(value):
         formatted = formatted.rstrip('0').rstrip('.')
     return formatted
 
+# Matches fraction input like '1/2', '1/100' (compiled once)
+_FRACTION_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*$')
+
+def parse_number(value, default=1.0):
+    """Parse a weight/denomination: plain number or fraction like '1/10'
+
+    One function for both metals weights and goldback denominations,
+    with explicit checks instead of exceptions as control flow.
+    """
+    if value is None or value == '':
+        return default
+    value_str = str(value).strip()
+    match = _FRACTION_RE.match(value_str)
+    if match:
+        denominator = float(match.group(2))
+        return float(match.group(1)) / denominator if denominator else default
+    try:
+        return float(value_str)
+    except ValueError:
+        return default
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def save_upload_file(file, category='metals'):
     """Save uploaded file and return the relative path"""
     if file and allowed_file(file.filename):
-        # Generate unique filename
-        ext = file.filename.rsplit('.', 1)[1].lower()
+        # Generate unique filename (extension from the sanitized name)
+        ext = secure_filename(file.filename).rsplit('.', 1)[-1].lower()
         filename = f"{uuid.uuid4().hex}.{ext}"
-        
-        # Save to category folder
-        filepath = os.path.join(UPLOAD_FOLDER, category, filename)
-        file.save(filepath)
-        
+        filepath = CATEGORY_DIRS[category] / filename
+
+        # Stream to a temp file in 1 MiB chunks (bounded memory), then
+        # rename atomically so a half-written image is never served
+        tmp_path = filepath.with_name(filepath.name + '.part')
+        with open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(file.stream, dst, length=1 << 20)
+        os.replace(tmp_path, filepath)
+
+        # Generate a small WebP thumbnail for table views - a fraction
+        # of the original's bytes on every page render
+        try:
+            with Image.open(filepath) as img:
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((400, 400))
+                if img.mode not in ('RGB', 'RGBA'):
+                    img = img.convert('RGB')
+                img.save(thumb_path(filepath), 'WEBP', quality=80, method=6)
+        except Exception as e:
+            logger.error(f"[ERROR] Thumbnail for {filename}: {e}")
+
         # Return relative path for database
         return f"{category}/{filename}"
     return None
 
-# Background task for updating metal prices
-def update_prices_periodically():
-    """Background thread to update metal prices every 30 minutes"""
-    # Fetch prices immediately on first run
-    try:
-        start = time.time()
-        price_fetcher.fetch_all_prices()
-    except Exception as e:
-        print(f"[ERROR] Startup price check: {e}")
-    
+def thumb_path(image_path):
+    """Thumbnail path for an image path (same name, .thumb.webp suffix)"""
+    return f"{str(image_path).rsplit('.', 1)[0]}.thumb.webp"
+
+# File deletions run on a single background thread: handlers enqueue
+# and return as soon as the DB commit is durable, so a slow or network
+# filesystem never holds up the response
+_deletion_q = queue.Queue()
+
+def _drain_deletions():
     while True:
-        # Wait 30 minutes (1800 seconds)
-        time.sleep(1800)
-        
+        path = _deletion_q.get()
         try:
-            print("[INFO] Updating prices...")
-            price_fetcher.fetch_all_prices()
-        except Exception as e:
-            print(f"[ERROR] Updating prices: {e}")
+            os.unlink(path)
+        except FileNotFoundError:
+            pass  # Already gone (or never had a thumbnail)
+        except OSError as e:
+            logger.error(f"[ERROR] Deleting {path}: {e}")
+
+threading.Thread(target=_drain_deletions, daemon=True).start()
+
+def delete_upload_file(image_filename):
+    """Queue a stored upload and its thumbnail for deletion"""
+    image_path = UPLOAD_ROOT / image_filename
+    _deletion_q.put(image_path)
+    _deletion_q.put(Path(thumb_path(image_path)))
+
+@app.template_filter('thumb')
+def thumb(image_filename):
+    """Thumbnail variant of a stored image, falling back to the original
+    for images uploaded before thumbnails existed"""
+    if not image_filename:
+        return image_filename
+    thumb_name = thumb_path(image_filename)
+    if (UPLOAD_ROOT / thumb_name).exists():
+        return thumb_name
+    return image_filename
+
+# Background price updates (single scheduler thread, first run immediately)
+price_scheduler = None
 
-# Start background thread
 def start_price_updater():
-    # Start background thread (will fetch immediately, then every 30 min)
-    thread = threading.Thread(target=update_prices_periodically, daemon=True)
-    thread.start()
+    # One scheduler thread replaces the sleep-loop worker; coalesce and
+    # max_instances keep runs from stacking up if a fetch is slow
+    global price_scheduler
+    price_scheduler = BackgroundScheduler(daemon=True)
+    price_scheduler.add_job(price_fetcher.fetch_all_prices, 'interval',
+                            seconds=price_fetcher.REFRESH_INTERVAL,
+                            next_run_time=datetime.now(),
+                            coalesce=True, max_instances=1,
+                            id='price-refresh')
+    price_scheduler.start()
+
+def request_price_refresh():
+    """Ask for an out-of-band price refresh without blocking the request
+
+    Reuses the scheduler's job (coalesce/max_instances then guarantee a
+    single fetch no matter how many clients ask at once) by pulling its
+    next run time forward. Falls back to a one-off thread when the
+    scheduler is disabled.
+    """
+    if price_scheduler:
+        price_scheduler.modify_job('price-refresh', next_run_time=datetime.now())
+    else:
+        threading.Thread(target=price_fetcher.fetch_all_prices, daemon=True).start()
+
+@app.cli.command('update-prices')
+def update_prices_command():
+    """Fetch metal prices once (for an external cron/systemd timer)
+
+    Pair with DISABLE_PRICE_SCHEDULER=1 to move fetching out of the web
+    process entirely; the server picks up the written snapshot.
+    """
+    price_fetcher.fetch_all_prices()
+
+def current_gold_price():
+    """Gold price for this request, looked up once and memoized on flask.g
+
+    Goldback.worth is accessed several times per row during a render;
+    this keeps that at one fetcher lookup per request instead of 2-3N.
+    """
+    if not has_request_context():
+        return price_fetcher.get_price('gold') or 0.0
+    if 'gold_price' not in g:
+        g.gold_price = price_fetcher.get_price('gold') or 0.0
+    return g.gold_price
+
+# Fraction display tables, built once at import instead of per property
+# access (these run once per row on every table render)
+_WEIGHT_FRACTIONS = (
+    (0.005, '1/200'),
+    (0.01, '1/100'),
+    (0.02, '1/50'),
+    (0.05, '1/20'),
+    (0.1, '1/10'),
+    (0.25, '1/4'),
+    (0.5, '1/2')
+)
+_DENOM_FRACTIONS = {0.5: '1/2', 0.25: '1/4'}
 
 # Models
 class Metal(db.Model):
+    # Indexes for the dashboard's gold/silver filters, the form
+    # breakdown grouping, and the metals page sort
+    __table_args__ = (
+        db.Index('ix_metal_metal', 'metal'),
+        db.Index('ix_metal_form', 'form'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     metal = db.Column(db.String(50), nullable=False)
     form = db.Column(db.String(50), nullable=False)
@@ -150,7 +372,11 @@ class Metal(db.Model):
     brand = db.Column(db.String(50))
     notes = db.Column(db.Text)
     image_filename = db.Column(db.String(255))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Python-side default as well: databases created before this column
+    # existed lack the DDL default (create_all skips existing tables).
+    # UTC to match both CURRENT_TIMESTAMP and the pre-existing rows
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           server_default=func.now())
     
     @property
     def weight_display(self):
@@ -158,19 +384,8 @@ class Metal(db.Model):
         if not self.weight_oz:
             return '-'
 
-        # Common fraction mappings
-        fractions = {
-            0.005: '1/200',
-            0.01: '1/100',
-            0.02: '1/50',
-            0.05: '1/20',
-            0.1: '1/10',
-            0.25: '1/4',
-            0.5: '1/2'
-        }
-
         # Check if weight matches a common fraction (with small tolerance for float precision)
-        for decimal, fraction in fractions.items():
+        for decimal, fraction in _WEIGHT_FRACTIONS:
             if abs(self.weight_oz - decimal) < 0.0001:
                 return fraction
         
@@ -207,11 +422,47 @@ class Metal(db.Model):
     
     @property
     def gain_loss_percent(self):
-        if self.total_cost == 0 or self.total_cost is None:
-            return 0.0
-        return ((self.calculated_value - self.total_cost) / self.total_cost) * 100
+        # Branchless: `or 1` keeps the division safe and the bool factor
+        # zeroes the result when there's no cost basis
+        cost = self.total_cost
+        return (self.calculated_value - (cost or 0)) / (cost or 1) * 100 * bool(cost)
+
+    # API payload keys and the attributes that fill them, zipped through
+    # one C-implemented attrgetter call per row instead of a dict
+    # literal's repeated attribute lookups (calculated_value is exposed
+    # as current_value)
+    _DICT_KEYS = ('id', 'metal', 'form', 'count', 'weight_oz', 'purity', 'year',
+                  'total_cost', 'current_value', 'gain_loss', 'brand', 'notes',
+                  'image_filename')
+    _DICT_GETTER = operator.attrgetter(
+        'id', 'metal', 'form', 'count', 'weight_oz', 'purity', 'year',
+        'total_cost', 'calculated_value', 'gain_loss', 'brand', 'notes',
+        'image_filename')
+
+    def to_dict(self):
+        return dict(zip(self._DICT_KEYS, self._DICT_GETTER(self)))
+
+    @classmethod
+    def list_for_display(cls):
+        """All metals in display order: Gold, Silver, then others, then
+        form (A-Z), weight (ascending), quantity (descending)
+
+        Sorting happens in SQL (native comparator, index-assisted)
+        instead of a Python list.sort over hydrated objects. Also the
+        one place to hang loader options (selectinload etc.) if
+        relationships ever get added, so the views can't regress into
+        per-row lazy loads.
+        """
+        priority = case((cls.metal == 'Gold', 0), (cls.metal == 'Silver', 1), else_=2)
+        return cls.query.order_by(priority, cls.form, cls.weight_oz, cls.count.desc()).all()
 
 class Coin(db.Model):
+    # country/year serves the coins page sort; worth serves the top-10 query
+    __table_args__ = (
+        db.Index('ix_coin_country_year', 'country', 'year'),
+        db.Index('ix_coin_worth', 'worth'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     material = db.Column(db.String(50))  # Gold, Silver, Copper, etc.
     country = db.Column(db.String(100))  # Country of origin
@@ -226,13 +477,28 @@ class Coin(db.Model):
     km_url = db.Column(db.String(500))  # URL to numista or other reference
     notes = db.Column(db.Text)
     image_filename = db.Column(db.String(255))  # Image filename
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Python-side default as well: databases created before this column
+    # existed lack the DDL default (create_all skips existing tables).
+    # UTC to match both CURRENT_TIMESTAMP and the pre-existing rows
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           server_default=func.now())
     
     @property
     def gain_loss(self):
         return self.worth - self.total_cost
 
+    @classmethod
+    def list_for_display(cls):
+        """All coins sorted by country then year, in SQL (uses
+        ix_coin_country_year; see Metal.list_for_display)"""
+        return cls.query.order_by(cls.country, cls.year).all()
+
 class Goldback(db.Model):
+    # Serves the goldbacks page state/denomination sort
+    __table_args__ = (
+        db.Index('ix_goldback_state_denom', 'state', 'denomination'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     state = db.Column(db.String(50))  # State
     denomination = db.Column(db.Float)  # Can be 1, 5, 10, 25, 50, 0.5, 0.25, etc.
@@ -244,7 +510,11 @@ class Goldback(db.Model):
     circulated = db.Column(db.String(10), default='No')  # Yes/No
     notes = db.Column(db.Text)
     image_filename = db.Column(db.String(255))  # Image filename
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Python-side default as well: databases created before this column
+    # existed lack the DDL default (create_all skips existing tables).
+    # UTC to match both CURRENT_TIMESTAMP and the pre-existing rows
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           server_default=func.now())
     
     @property
     def gb_total(self):
@@ -256,10 +526,9 @@ class Goldback(db.Model):
     @property
     def denomination_display(self):
         """Convert decimal to fraction for display"""
-        if self.denomination == 0.5:
-            return '1/2'
-        elif self.denomination == 0.25:
-            return '1/4'
+        fraction = _DENOM_FRACTIONS.get(self.denomination)
+        if fraction:
+            return fraction
         elif self.denomination and self.denomination == int(self.denomination):
             return str(int(self.denomination))
         else:
@@ -273,8 +542,8 @@ class Goldback(db.Model):
         Premium multiplier of 2x reflects market pricing
         """
         if self.denomination:
-            # Get current gold price
-            gold_price = price_fetcher.get_price('gold')
+            # Get current gold price (memoized per request)
+            gold_price = current_gold_price()
             if gold_price:
                 # Gold content in oz: denomination / 1000
                 # Market value: spot × 2 (100% premium)
@@ -287,6 +556,31 @@ class Goldback(db.Model):
     def gain_loss(self):
         return self.worth - self.cost
 
+    # Same pattern as Metal.to_dict; every key maps to the attribute of
+    # the same name
+    _DICT_KEYS = ('id', 'state', 'denomination', 'year', 'count', 'alpha',
+                  'serial', 'cost', 'worth', 'gain_loss', 'circulated', 'notes',
+                  'image_filename')
+    _DICT_GETTER = operator.attrgetter(*_DICT_KEYS)
+
+    def to_dict(self):
+        return dict(zip(self._DICT_KEYS, self._DICT_GETTER(self)))
+
+    @classmethod
+    def list_for_display(cls):
+        """All goldbacks sorted by state then denomination, in SQL (uses
+        ix_goldback_state_denom; see Metal.list_for_display)"""
+        return cls.query.order_by(cls.state, cls.denomination).all()
+
+# Exact projection for the coins API - built once. gain_loss is a SQL
+# expression so the whole payload comes straight off the cursor.
+_COIN_COLS = (
+    Coin.id, Coin.material, Coin.country, Coin.year, Coin.weight,
+    Coin.denomination, Coin.quantity, Coin.total_cost, Coin.worth,
+    (Coin.worth - Coin.total_cost).label('gain_loss'),
+    Coin.worth_updated, Coin.km, Coin.km_url, Coin.notes, Coin.image_filename
+)
+
 # Routes
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -331,13 +625,13 @@ def login():
             if lockout_until:
                 unlock_time = datetime.fromtimestamp(lockout_until).strftime('%H:%M:%S')
                 ip = request.headers.get('X-Forwarded-For', request.remote_addr).split(',')[0].strip()
-                print(f"[LOGIN] {ip}  Too many login fails. Locked for {lockout_secs}s")
+                logger.warning(f"[LOGIN] {ip}  Too many login fails. Locked for {lockout_secs}s")
                 remaining = lockout_secs
                 return render_template('login.html', lockout_remaining=remaining)
             else:
                 attempts_left = 3 - tries
                 ip = request.headers.get('X-Forwarded-For', request.remote_addr).split(',')[0].strip()
-                print(f"[LOGIN] {ip}  Failed attempt {tries}/2")
+                logger.warning(f"[LOGIN] {ip}  Failed attempt {tries}/2")
                 flash(f'Invalid credentials. {attempts_left} attempt{"s" if attempts_left != 1 else ""} left.')
     
     return render_template('login.html', lockout_remaining=0)
@@ -355,31 +649,61 @@ def index():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Get all data
-    metals_list = Metal.query.all()
-    coins_list = Coin.query.all()
-    goldbacks_list = Goldback.query.all()
-    
-    # Calculate individual category stats
-    metals_cost = sum(m.total_cost for m in metals_list)
-    metals_value = sum(m.calculated_value for m in metals_list)
+    # All totals come from aggregate queries - SQLite sums the columns
+    # itself instead of us hydrating every row and looping in Python
+    gold_price = current_gold_price()
+    silver_price = price_fetcher.get_price('silver') or 0.0
+
+    metal_count = func.coalesce(Metal.count, 1)
+    metal_lower = func.lower(Metal.metal)
+
+    # Metals: counts, cost, and oz totals split by metal in one pass
+    (metals_count, metals_cost, metals_total_oz,
+     metals_gold_oz, metals_silver_oz, metals_other_value) = db.session.query(
+        func.count(Metal.id),
+        func.coalesce(func.sum(Metal.total_cost), 0.0),
+        func.coalesce(func.sum(Metal.weight_oz * metal_count), 0.0),
+        func.coalesce(func.sum(case((metal_lower == 'gold', Metal.weight_oz * metal_count), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((metal_lower == 'silver', Metal.weight_oz * metal_count), else_=0.0)), 0.0),
+        # Metals other than gold/silver have no live price - stored value
+        func.coalesce(func.sum(case((metal_lower.notin_(('gold', 'silver')), Metal.current_value), else_=0.0)), 0.0)
+    ).one()
+
+    # Live value = oz held × spot price (same math as Metal.calculated_value)
+    metals_value = (metals_gold_oz * gold_price
+                    + metals_silver_oz * silver_price
+                    + metals_other_value)
     metals_gain = metals_value - metals_cost
-    
-    coins_cost = sum(c.total_cost for c in coins_list)
-    coins_value = sum(c.worth for c in coins_list)
+
+    # Coins: totals plus gold/silver value split by material
+    (coins_count, coins_cost, coins_value,
+     coins_gold_value, coins_silver_value) = db.session.query(
+        func.count(Coin.id),
+        func.coalesce(func.sum(Coin.total_cost), 0.0),
+        func.coalesce(func.sum(Coin.worth), 0.0),
+        func.coalesce(func.sum(case((func.lower(Coin.material) == 'gold', Coin.worth), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((func.lower(Coin.material) == 'silver', Coin.worth), else_=0.0)), 0.0)
+    ).one()
     coins_gain = coins_value - coins_cost
-    
-    goldbacks_cost = sum(g.cost for g in goldbacks_list)
-    goldbacks_value = sum(g.worth for g in goldbacks_list)
+
+    # Goldbacks: worth is price-dependent, so pull the denomination×count
+    # total as one scalar and apply the price formula once
+    (goldbacks_count, goldbacks_cost, goldbacks_total_gb) = db.session.query(
+        func.count(Goldback.id),
+        func.coalesce(func.sum(Goldback.cost), 0.0),
+        func.coalesce(func.sum(Goldback.denomination * func.coalesce(Goldback.count, 1)), 0.0)
+    ).one()
+    # Each Goldback contains denomination/1000 oz of gold, valued at 2x spot
+    goldbacks_oz = goldbacks_total_gb / 1000.0
+    goldbacks_value = goldbacks_oz * gold_price * 2.0
     goldbacks_gain = goldbacks_value - goldbacks_cost
-    goldbacks_total_gb = sum(g.gb_total for g in goldbacks_list)
-    
+
     # Calculate overall totals
     total_cost = metals_cost + coins_cost + goldbacks_cost
     total_value = metals_value + coins_value + goldbacks_value
     total_gain = total_value - total_cost
     total_gain_percent = ((total_gain / total_cost) * 100) if total_cost > 0 else 0
-    
+
     # Overall stats
     overall_stats = {
         'cost_basis': total_cost,
@@ -387,13 +711,13 @@ def dashboard():
         'gain_loss': total_gain,
         'gain_loss_percent': total_gain_percent
     }
-    
+
     # Category breakdowns (as list for sorting)
     categories = [
         {
             'key': 'coins',
             'name': 'Coins',
-            'count': len(coins_list),
+            'count': coins_count,
             'cost': coins_cost,
             'value': coins_value,
             'gain': coins_gain,
@@ -402,94 +726,70 @@ def dashboard():
         {
             'key': 'goldbacks',
             'name': 'Goldbacks',
-            'count': len(goldbacks_list),
+            'count': goldbacks_count,
             'cost': goldbacks_cost,
             'value': goldbacks_value,
             'gain': goldbacks_gain,
             'gain_percent': ((goldbacks_gain / goldbacks_cost) * 100) if goldbacks_cost > 0 else 0,
             'gb_total': goldbacks_total_gb,
-            'total_oz': sum((g.denomination / 1000.0) * g.count for g in goldbacks_list if g.denomination)
+            'total_oz': goldbacks_oz
         },
         {
             'key': 'metals',
             'name': 'Metals',
-            'count': len(metals_list),
+            'count': metals_count,
             'cost': metals_cost,
             'value': metals_value,
             'gain': metals_gain,
             'gain_percent': ((metals_gain / metals_cost) * 100) if metals_cost > 0 else 0,
-            'total_oz': sum((m.weight_oz or 0) * (m.count or 0) for m in metals_list),
-            'gold_oz': sum((m.weight_oz or 0) * (m.count or 0) for m in metals_list if m.metal and m.metal.lower() == 'gold'),
-            'silver_oz': sum((m.weight_oz or 0) * (m.count or 0) for m in metals_list if m.metal and m.metal.lower() == 'silver')
+            'total_oz': metals_total_oz,
+            'gold_oz': metals_gold_oz,
+            'silver_oz': metals_silver_oz
         }
     ]
-    
+
     # Sort alphabetically by name
     categories.sort(key=lambda x: x['name'])
-    
-    # Calculate Gold vs Silver breakdown
-    gold_value = 0.0
-    gold_oz = 0.0
-    silver_value = 0.0
-    silver_oz = 0.0
-    
-    # Metals-only tracking
-    gold_value_metals_only = 0.0
-    gold_oz_metals_only = 0.0
-    silver_value_metals_only = 0.0
-    silver_oz_metals_only = 0.0
-    
-    # From Metals table
-    for metal in metals_list:
-        if metal.metal and metal.metal.lower() == 'gold':
-            gold_value += metal.calculated_value
-            gold_oz += (metal.weight_oz * metal.count) if metal.weight_oz else 0
-            gold_value_metals_only += metal.calculated_value
-            gold_oz_metals_only += (metal.weight_oz * metal.count) if metal.weight_oz else 0
-        elif metal.metal and metal.metal.lower() == 'silver':
-            silver_value += metal.calculated_value
-            silver_oz += (metal.weight_oz * metal.count) if metal.weight_oz else 0
-            silver_value_metals_only += metal.calculated_value
-            silver_oz_metals_only += (metal.weight_oz * metal.count) if metal.weight_oz else 0
-    
-    # From Coins table (if material is specified)
-    for coin in coins_list:
-        if coin.material and coin.material.lower() == 'gold':
-            gold_value += coin.worth
-            # Coins don't have standardized oz weight, so we skip oz calculation
-        elif coin.material and coin.material.lower() == 'silver':
-            silver_value += coin.worth
-    
-    # From Goldbacks (all gold-based)
-    for goldback in goldbacks_list:
-        gold_value += goldback.worth
-        # Each Goldback contains denomination/1000 oz of gold
-        if goldback.denomination:
-            gold_oz += (goldback.denomination / 1000.0) * goldback.count
-    
+
+    # Gold vs Silver breakdown, derived from the aggregates above
     metal_breakdown = {
-        'gold_value': gold_value,
-        'gold_oz': gold_oz,
-        'silver_value': silver_value,
-        'silver_oz': silver_oz,
-        'gold_value_metals_only': gold_value_metals_only,
-        'gold_oz_metals_only': gold_oz_metals_only,
-        'silver_value_metals_only': silver_value_metals_only,
-        'silver_oz_metals_only': silver_oz_metals_only
+        'gold_value': metals_gold_oz * gold_price + coins_gold_value + goldbacks_value,
+        'gold_oz': metals_gold_oz + goldbacks_oz,
+        'silver_value': metals_silver_oz * silver_price + coins_silver_value,
+        'silver_oz': metals_silver_oz,
+        'gold_value_metals_only': metals_gold_oz * gold_price,
+        'gold_oz_metals_only': metals_gold_oz,
+        'silver_value_metals_only': metals_silver_oz * silver_price,
+        'silver_oz_metals_only': metals_silver_oz
     }
-    
-    # Calculate form breakdown for metals only
+
+    # Form breakdown for metals only (grouped in SQL; blank forms lumped
+    # under 'Other' here since SQL COALESCE only catches NULL)
     form_breakdown = {}
-    for metal in metals_list:
-        form = metal.form if metal.form else 'Other'
-        if form not in form_breakdown:
-            form_breakdown[form] = 0
-        form_breakdown[form] += (metal.weight_oz or 0) * (metal.count or 1)
-    
-    # Get top worth items for each category
-    top_coins = sorted(coins_list, key=lambda x: x.worth, reverse=True)[:10]
-    top_goldbacks = sorted(goldbacks_list, key=lambda x: x.worth, reverse=True)[:10]
-    top_metals = sorted(metals_list, key=lambda x: x.calculated_value, reverse=True)[:10]
+    for form, oz in db.session.query(
+            Metal.form,
+            func.coalesce(func.sum(func.coalesce(Metal.weight_oz, 0.0) * metal_count), 0.0)
+            ).group_by(Metal.form):
+        key = form if form else 'Other'
+        form_breakdown[key] = form_breakdown.get(key, 0) + oz
+
+    # Top worth items for each category - small ORDER BY ... LIMIT
+    # queries that pull only the displayed columns as keyed tuples, so
+    # no ORM instances get built for rows the template reads 3 fields of.
+    # Worth is computed in SQL from the same price formulas.
+    metal_value_expr = case(
+        (metal_lower == 'gold', Metal.weight_oz * metal_count * gold_price),
+        (metal_lower == 'silver', Metal.weight_oz * metal_count * silver_price),
+        else_=Metal.current_value
+    ).label('calculated_value')
+    goldback_worth_expr = (Goldback.denomination * func.coalesce(Goldback.count, 1)
+                           * (gold_price * 2.0 / 1000.0)).label('worth')
+    top_coins = db.session.query(Coin.country, Coin.denomination, Coin.worth) \
+        .order_by(Coin.worth.desc()).limit(10).all()
+    top_goldbacks = db.session.query(Goldback.state, Goldback.denomination, goldback_worth_expr) \
+        .order_by(goldback_worth_expr.desc()).limit(10).all()
+    top_metals = db.session.query(Metal.metal, Metal.form, metal_value_expr) \
+        .order_by(metal_value_expr.desc()).limit(10).all()
     
     return render_template('dashboard.html', 
                          active_page='dashboard',
@@ -504,11 +804,8 @@ def dashboard():
 @app.route('/coins')
 @login_required
 def coins():
-    coins_list = Coin.query.all()
-    
-    # Sort by country (A-Z) then by year
-    coins_list.sort(key=lambda c: (c.country or '', c.year or ''))
-    
+    coins_list = Coin.list_for_display()
+
     # Calculate stats
     total_cost = sum(c.total_cost for c in coins_list)
     total_worth = sum(c.worth for c in coins_list)
@@ -527,11 +824,8 @@ def coins():
 @app.route('/goldbacks')
 @login_required
 def goldbacks():
-    goldbacks_list = Goldback.query.all()
-    
-    # Sort by state (A-Z) then by denomination (ascending)
-    goldbacks_list.sort(key=lambda g: (g.state or '', g.denomination or 0))
-    
+    goldbacks_list = Goldback.list_for_display()
+
     # Calculate stats
     total_cost = sum(g.cost for g in goldbacks_list)
     total_worth = sum(g.worth for g in goldbacks_list)
@@ -541,7 +835,7 @@ def goldbacks():
     
     # Calculate GB rate (current value per 1 goldback)
     # Using gold price: (1/1000 oz) × gold_price × 2
-    gold_price = price_fetcher.get_price('gold')
+    gold_price = current_gold_price()
     gb_rate = (gold_price / 1000.0 * 2.0) if gold_price else 0.0
     
     stats = {
@@ -558,17 +852,8 @@ def goldbacks():
 @app.route('/metals')
 @login_required
 def metals():
-    metals_list = Metal.query.all()
-    
-    # Custom sort: Metal (Gold first, then Silver), then Form (A-Z), then Weight (ascending), then Quantity (descending)
-    def metal_sort_key(m):
-        # Metal priority: Gold=0, Silver=1, others=2
-        metal_priority = 0 if m.metal == 'Gold' else (1 if m.metal == 'Silver' else 2)
-        # Negate count for descending order (high to low)
-        return (metal_priority, m.form or '', m.weight_oz or 0, -(m.count or 0))
-    
-    metals_list.sort(key=metal_sort_key)
-    
+    metals_list = Metal.list_for_display()
+
     # Calculate stats
     total_cost = sum(m.total_cost for m in metals_list)
     total_current_value = sum(m.calculated_value for m in metals_list)
@@ -591,22 +876,7 @@ def metals():
 @app.route('/api/metals', methods=['GET'])
 @login_required
 def get_metals():
-    metals_list = Metal.query.all()
-    return jsonify([{
-        'id': m.id,
-        'metal': m.metal,
-        'form': m.form,
-        'count': m.count,
-        'weight_oz': m.weight_oz,
-        'purity': m.purity,
-        'year': m.year,
-        'total_cost': m.total_cost,
-        'current_value': m.calculated_value,
-        'gain_loss': m.gain_loss,
-        'brand': m.brand,
-        'notes': m.notes,
-        'image_filename': m.image_filename
-    } for m in metals_list])
+    return jsonify([m.to_dict() for m in Metal.list_for_display()])
 
 @app.route('/api/metals', methods=['POST'])
 @login_required
@@ -623,13 +893,13 @@ def add_metal():
         if request.content_type and 'multipart/form-data' in request.content_type:
             data = request.form.to_dict()
             data['count'] = int(data.get('count', 1))
-            data['weight_oz'] = parse_weight(data.get('weight_oz', '1'))
+            data['weight_oz'] = parse_number(data.get('weight_oz', '1'))
             data['total_cost'] = float(data['total_cost'])
             data['current_value'] = float(data.get('current_value', 0))
         else:
             data = request.json
             if 'weight_oz' in data:
-                data['weight_oz'] = parse_weight(data['weight_oz'])
+                data['weight_oz'] = parse_number(data['weight_oz'])
         
         new_metal = Metal(
             metal=data['metal'],
@@ -649,12 +919,47 @@ def add_metal():
         return jsonify({'success': True, 'id': new_metal.id}), 201
 
     except Exception as e:
-        print(f"[ERROR] Adding metal: {e}")
+        logger.error(f"[ERROR] Adding metal: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/metals/bulk', methods=['POST'])
 @login_required
+def add_metals_bulk():
+    """Insert many metals in one transaction (for imports)
+
+    Uses a Core executemany instead of per-row session.add/commit:
+    one fsync for the whole batch and no per-row unit-of-work overhead.
+    """
+    try:
+        items = request.json
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'Expected a non-empty list'}), 400
+
+        payloads = [{
+            'metal': item['metal'],
+            'form': item['form'],
+            'count': item.get('count', 1),
+            'weight_oz': parse_number(item.get('weight_oz', '1')),
+            'purity': item['purity'],
+            'year': item.get('year', ''),
+            'total_cost': item['total_cost'],
+            'current_value': item.get('current_value', 0),
+            'brand': item.get('brand', ''),
+            'notes': item.get('notes', '')
+        } for item in items]
+
+        db.session.execute(db.insert(Metal.__table__), payloads)
+        db.session.commit()
+        return jsonify({'success': True, 'count': len(payloads)}), 201
+
+    except Exception as e:
+        logger.error(f"[ERROR] Bulk adding metals: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 @app.route('/api/metals/<int:id>', methods=['PUT'])
+@login_required
 def update_metal(id):
     metal = Metal.query.get_or_404(id)
     data = request.json
@@ -663,7 +968,7 @@ def update_metal(id):
     metal.form = data.get('form', metal.form)
     metal.count = data.get('count', metal.count)
     if 'weight_oz' in data:
-        metal.weight_oz = parse_weight(data['weight_oz'])
+        metal.weight_oz = parse_number(data['weight_oz'])
     metal.purity = data.get('purity', metal.purity)
     metal.year = data.get('year', metal.year)
     metal.total_cost = data.get('total_cost', metal.total_cost)
@@ -674,23 +979,21 @@ def update_metal(id):
     db.session.commit()
     return jsonify({'success': True})
 
-@login_required
 @app.route('/api/metals/<int:id>', methods=['DELETE'])
+@login_required
 def delete_metal(id):
     metal = Metal.query.get_or_404(id)
     
-    # Delete associated image file if it exists
+    # Delete associated image file (and thumbnail) if it exists
     if metal.image_filename:
-        image_path = os.path.join(UPLOAD_FOLDER, metal.image_filename)
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        delete_upload_file(metal.image_filename)
     
     db.session.delete(metal)
     db.session.commit()
     return jsonify({'success': True})
 
-@login_required
 @app.route('/api/metals/<int:id>/image', methods=['POST'])
+@login_required
 def upload_metal_image(id):
     try:
         metal = Metal.query.get_or_404(id)
@@ -702,11 +1005,9 @@ def upload_metal_image(id):
         if not file.filename:
             return jsonify({'success': False, 'error': 'No file selected'}), 400
 
-        # Delete old image if exists
+        # Delete old image (and thumbnail) if exists
         if metal.image_filename:
-            old_path = os.path.join(UPLOAD_FOLDER, metal.image_filename)
-            if os.path.exists(old_path):
-                os.remove(old_path)
+            delete_upload_file(metal.image_filename)
 
         # Save new image
         image_filename = save_upload_file(file, 'metals')
@@ -719,73 +1020,18 @@ def upload_metal_image(id):
         return jsonify({'success': True})
 
     except Exception as e:
-        print(f"[ERROR] Uploading image: {e}")
+        logger.error(f"[ERROR] Uploading image: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
 # Goldbacks API Endpoints
-@login_required
 @app.route('/api/goldbacks', methods=['GET'])
+@login_required
 def get_goldbacks():
-    goldbacks_list = Goldback.query.all()
-    return jsonify([{
-        'id': g.id,
-        'state': g.state,
-        'denomination': g.denomination,
-        'year': g.year,
-        'count': g.count,
-        'alpha': g.alpha,
-        'serial': g.serial,
-        'cost': g.cost,
-        'worth': g.worth,
-        'gain_loss': g.gain_loss,
-        'circulated': g.circulated,
-        'notes': g.notes,
-        'image_filename': g.image_filename
-    } for g in goldbacks_list])
-
-def parse_weight(value):
-    """Convert fraction strings like '1/200', '1/100' to decimals for weight"""
-    if not value or value == '':
-        return 1.0
-    
-    value_str = str(value).strip()
-    
-    # Check for fractions
-    if '/' in value_str:
-        try:
-            parts = value_str.split('/')
-            return float(parts[0]) / float(parts[1])
-        except:
-            return float(value_str)
-    else:
-        try:
-            return float(value_str)
-        except:
-            return 1.0
-
-def parse_denomination(value):
-    """Convert fraction strings like '1/2', '1/4' to decimals"""
-    if not value or value == '':
-        return 1.0
-    
-    value_str = str(value).strip()
-    
-    # Check for fractions
-    if '/' in value_str:
-        try:
-            parts = value_str.split('/')
-            return float(parts[0]) / float(parts[1])
-        except:
-            return float(value_str)
-    else:
-        try:
-            return float(value_str)
-        except:
-            return 1.0
+    return jsonify([g.to_dict() for g in Goldback.list_for_display()])
 
-@login_required
 @app.route('/api/goldbacks', methods=['POST'])
+@login_required
 def add_goldback():
     try:
         # Handle file upload if present
@@ -799,12 +1045,12 @@ def add_goldback():
         if request.content_type and 'multipart/form-data' in request.content_type:
             data = request.form.to_dict()
             data['count'] = int(data.get('count', 1))
-            data['denomination'] = parse_denomination(data.get('denomination', '1'))
+            data['denomination'] = parse_number(data.get('denomination', '1'))
             data['cost'] = float(data.get('cost', 0))
         else:
             data = request.json
             if 'denomination' in data:
-                data['denomination'] = parse_denomination(data['denomination'])
+                data['denomination'] = parse_number(data['denomination'])
         
         new_goldback = Goldback(
             state=data.get('state', ''),
@@ -823,19 +1069,19 @@ def add_goldback():
         return jsonify({'success': True, 'id': new_goldback.id}), 201
     
     except Exception as e:
-        print(f"[ERROR] Adding goldback: {e}")
+        logger.error(f"[ERROR] Adding goldback: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
-@login_required
 @app.route('/api/goldbacks/<int:id>', methods=['PUT'])
+@login_required
 def update_goldback(id):
     goldback = Goldback.query.get_or_404(id)
     data = request.json
     
     goldback.state = data.get('state', goldback.state)
     if 'denomination' in data:
-        goldback.denomination = parse_denomination(data['denomination'])
+        goldback.denomination = parse_number(data['denomination'])
     goldback.year = data.get('year', goldback.year)
     goldback.count = data.get('count', goldback.count)
     goldback.alpha = data.get('alpha', goldback.alpha)
@@ -847,23 +1093,21 @@ def update_goldback(id):
     db.session.commit()
     return jsonify({'success': True})
 
-@login_required
 @app.route('/api/goldbacks/<int:id>', methods=['DELETE'])
+@login_required
 def delete_goldback(id):
     goldback = Goldback.query.get_or_404(id)
     
-    # Delete associated image file if it exists
+    # Delete associated image file (and thumbnail) if it exists
     if goldback.image_filename:
-        image_path = os.path.join(UPLOAD_FOLDER, goldback.image_filename)
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        delete_upload_file(goldback.image_filename)
     
     db.session.delete(goldback)
     db.session.commit()
     return jsonify({'success': True})
 
-@login_required
 @app.route('/api/goldbacks/<int:id>/image', methods=['POST'])
+@login_required
 def upload_goldback_image(id):
     """Upload or replace image for existing goldback entry"""
     try:
@@ -876,11 +1120,9 @@ def upload_goldback_image(id):
         if not file.filename:
             return jsonify({'success': False, 'error': 'No file selected'}), 400
         
-        # Delete old image if exists
+        # Delete old image (and thumbnail) if exists
         if goldback.image_filename:
-            old_path = os.path.join(UPLOAD_FOLDER, goldback.image_filename)
-            if os.path.exists(old_path):
-                os.remove(old_path)
+            delete_upload_file(goldback.image_filename)
         
         # Save new image
         image_filename = save_upload_file(file, 'goldbacks')
@@ -893,46 +1135,173 @@ def upload_goldback_image(id):
         return jsonify({'success': True})
     
     except Exception as e:
-        print(f"[ERROR] Uploading image: {e}")
+        logger.error(f"[ERROR] Uploading image: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
 # Metal prices API endpoint
-@login_required
 @app.route('/api/prices', methods=['GET'])
+@login_required
 def get_prices():
     """Get current metal prices"""
     force_refresh = request.args.get('refresh', 'false').lower() == 'true'
     if force_refresh:
-        thread = threading.Thread(target=price_fetcher.fetch_all_prices)
-        thread.start()
-    return jsonify(price_fetcher.get_prices())
+        request_price_refresh()
 
-# Coins API Endpoints
+    # Conditional GET: the payload only changes when last_updated does,
+    # so an ETag lets pollers skip the body entirely when nothing changed.
+    # Weak (W/) because Flask-Compress appends :br/:gzip to strong tags,
+    # which would break this equality check once a body gets compressed
+    etag = f'W/"{price_fetcher.last_updated.timestamp() if price_fetcher.last_updated else 0}"'
+    if not force_refresh and request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+    # Pre-serialized in the fetcher - no dict build or encode per request
+    return Response(price_fetcher.get_serialized(), mimetype='application/json',
+                    headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+# Minimum gap between forced upstream refreshes (shared across clients)
+REFRESH_MIN_INTERVAL = 30  # seconds
+_refresh_state = {'lock': threading.Lock(), 'last': 0.0}
+
+@app.route('/api/prices/refresh', methods=['POST'])
+@login_required
+def refresh_prices():
+    """Force an upstream price refresh (rate-limited), return current prices
+
+    POST because it has side effects - a GET with side effects gets
+    replayed by caches, history navigation and prefetchers.
+    """
+    with _refresh_state['lock']:
+        now = time.monotonic()
+        if now - _refresh_state['last'] >= REFRESH_MIN_INTERVAL:
+            _refresh_state['last'] = now
+            request_price_refresh()
+    return Response(price_fetcher.get_serialized(), mimetype='application/json')
+
+# Each SSE connection pins one waitress thread for its whole lifetime
+# (the generator blocks in sleep between pushes), so cap them well below
+# the thread pool. Over-cap clients get a 503; EventSource surfaces that
+# as repeated errors and app.js falls back to polling.
+MAX_PRICE_STREAMS = 4
+_price_streams = {'count': 0, 'lock': threading.Lock()}
+
+@app.route('/api/prices/stream')
 @login_required
+def price_stream():
+    """SSE stream - pushes prices only when the cache actually refreshes"""
+    with _price_streams['lock']:
+        if _price_streams['count'] >= MAX_PRICE_STREAMS:
+            return Response(status=503, headers={'Retry-After': '60'})
+        _price_streams['count'] += 1
+
+    def event_stream():
+        try:
+            last_sent = False  # never matches a timestamp, so first loop always pushes
+            while True:
+                # get_serialized() picks up snapshot reloads and re-encodes
+                # only when a refresh actually landed
+                payload = price_fetcher.get_serialized()
+                if price_fetcher.last_updated != last_sent:
+                    last_sent = price_fetcher.last_updated
+                    yield f"data: {payload.decode()}\n\n"
+                else:
+                    # Keep-alive comment so proxies don't drop the connection
+                    yield ": ping\n\n"
+                time.sleep(21)
+        finally:
+            # Runs when the client disconnects (noticed on the next
+            # failed write) - frees the slot for another stream
+            with _price_streams['lock']:
+                _price_streams['count'] -= 1
+    return Response(event_stream(), mimetype='text/event-stream')
+
+# Coins API Endpoints
+
+# Short-TTL cache of the serialized /api/coins payload: repeat reads
+# within the window skip the query and the JSON encode entirely. Writes
+# invalidate immediately (and bump a version for change detection), the
+# TTL just bounds staleness if the DB is ever edited out-of-band.
+COINS_CACHE_TTL = 10  # seconds
+# Version is seeded with process start time so an ETag minted before a
+# restart can never falsely match a fresh counter that starts over at 0
+_coins_cache = {'body': None, 'expires': 0.0, 'version': 0, 'boot': int(time.time())}
+
+def _invalidate_coins_cache():
+    _coins_cache['version'] += 1
+    _coins_cache['body'] = None
+
+def _coins_body():
+    """Current serialized /api/coins payload, rebuilt on miss or TTL expiry"""
+    body = _coins_cache['body']
+    if body is None or time.monotonic() >= _coins_cache['expires']:
+        # Core projection: rows come back as plain mappings with
+        # exactly the columns the payload needs - no ORM instances,
+        # identity map or per-attribute descriptor overhead
+        rows = db.session.execute(
+            db.select(*_COIN_COLS).order_by(Coin.country, Coin.year)).mappings()
+        fresh = orjson.dumps(rows.all(), default=_json_default)
+        # An out-of-band DB edit surfaced by the TTL re-query must bump
+        # the version too, or conditional requests would 304 past it
+        if body is not None and fresh != body:
+            _coins_cache['version'] += 1
+        _coins_cache['body'] = fresh
+        _coins_cache['expires'] = time.monotonic() + COINS_CACHE_TTL
+        body = fresh
+    return body
+
 @app.route('/api/coins', methods=['GET'])
+@login_required
 def get_coins():
-    coins_list = Coin.query.all()
-    return jsonify([{
-        'id': c.id,
-        'material': c.material,
-        'country': c.country,
-        'year': c.year,
-        'weight': c.weight,
-        'denomination': c.denomination,
-        'quantity': c.quantity,
-        'total_cost': c.total_cost,
-        'worth': c.worth,
-        'gain_loss': c.gain_loss,
-        'worth_updated': c.worth_updated,
-        'km': c.km,
-        'km_url': c.km_url,
-        'notes': c.notes,
-        'image_filename': c.image_filename
-    } for c in coins_list])
+    # ETag from the cache version counter: it bumps on every write
+    # (including updates, which a max(id)/count fingerprint would miss),
+    # so a matching If-None-Match means the client's copy is current and
+    # the body can be skipped. The body is resolved before the ETag so
+    # the TTL staleness bound applies to conditional requests as well.
+    # Weak (W/) so Flask-Compress leaves the tag alone - it rewrites
+    # strong ETags to "...:br"/":gzip" on compressed bodies, which would
+    # defeat this compare on any collection over COMPRESS_MIN_SIZE
+    body = _coins_body()
+    etag = f'W/"coins-{_coins_cache["boot"]}-{_coins_cache["version"]}"'
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+    return Response(body, mimetype='application/json',
+                    headers={'ETag': etag, 'Cache-Control': 'no-cache'})
 
+@app.route('/api/coins.ndjson', methods=['GET'])
 @login_required
+def get_coins_ndjson():
+    """Stream the coins as NDJSON, one row per line
+
+    For big collections this keeps memory flat (rows are fetched in
+    server-side batches and encoded one at a time, never materializing
+    the whole list) and the first byte goes out at first-row latency.
+    """
+    def generate():
+        rows = db.session.execute(
+            db.select(*_COIN_COLS).order_by(Coin.country, Coin.year)
+            .execution_options(stream_results=True, yield_per=500)).mappings()
+        for row in rows:
+            yield orjson.dumps(row, default=_json_default) + b'\n'
+    return Response(stream_with_context(generate()),
+                    mimetype='application/x-ndjson', direct_passthrough=True)
+
+@app.route('/api/coins/summary', methods=['GET'])
+@login_required
+def get_coins_summary():
+    """List-view projection: only the columns a table render needs
+
+    Leaves the wide text columns (notes, km_url, serial refs) on disk -
+    fewer bytes read and marshalled per row than the full payload.
+    """
+    rows = db.session.execute(
+        db.select(Coin.id, Coin.material, Coin.country, Coin.year,
+                  Coin.quantity, Coin.worth, Coin.image_filename)
+        .order_by(Coin.country, Coin.year)).mappings()
+    return jsonify(rows.all())
+
 @app.route('/api/coins', methods=['POST'])
+@login_required
 def add_coin():
     try:
         # Handle file upload if present
@@ -968,17 +1337,55 @@ def add_coin():
         )
         db.session.add(new_coin)
         db.session.commit()
+        _invalidate_coins_cache()
         return jsonify({'success': True, 'id': new_coin.id}), 201
     
     except Exception as e:
-        print(f"[ERROR] Adding coin: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[ERROR] Adding coin: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/coins/bulk', methods=['POST'])
 @login_required
+def add_coins_bulk():
+    """Insert many coins in one transaction (for scripted imports)
+
+    One commit (one WAL fsync) for the whole batch instead of a full
+    transaction per row, and bulk_insert_mappings skips the per-object
+    unit-of-work bookkeeping.
+    """
+    try:
+        items = (request.json or {}).get('coins')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'Expected {"coins": [...]}'}), 400
+
+        payloads = [{
+            'material': item.get('material', ''),
+            'country': item.get('country', ''),
+            'year': item.get('year', ''),
+            'weight': item.get('weight', ''),
+            'denomination': item.get('denomination', ''),
+            'quantity': item.get('quantity', 1),
+            'total_cost': item.get('total_cost', 0),
+            'worth': item.get('worth', 0),
+            'worth_updated': item.get('worth_updated', ''),
+            'km': item.get('km', ''),
+            'km_url': item.get('km_url', ''),
+            'notes': item.get('notes', '')
+        } for item in items]
+
+        db.session.bulk_insert_mappings(Coin, payloads)
+        db.session.commit()
+        _invalidate_coins_cache()
+        return jsonify({'success': True, 'count': len(payloads)}), 201
+
+    except Exception as e:
+        logger.error(f"[ERROR] Bulk adding coins: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 @app.route('/api/coins/<int:id>', methods=['PUT'])
+@login_required
 def update_coin(id):
     coin = Coin.query.get_or_404(id)
     data = request.json
@@ -1002,25 +1409,25 @@ def update_coin(id):
     coin.notes = data.get('notes', coin.notes)
     
     db.session.commit()
+    _invalidate_coins_cache()
     return jsonify({'success': True})
 
-@login_required
 @app.route('/api/coins/<int:id>', methods=['DELETE'])
+@login_required
 def delete_coin(id):
     coin = Coin.query.get_or_404(id)
     
-    # Delete associated image file if it exists
+    # Delete associated image file (and thumbnail) if it exists
     if coin.image_filename:
-        image_path = os.path.join(UPLOAD_FOLDER, coin.image_filename)
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        delete_upload_file(coin.image_filename)
     
     db.session.delete(coin)
     db.session.commit()
+    _invalidate_coins_cache()
     return jsonify({'success': True})
 
-@login_required
 @app.route('/api/coins/<int:id>/image', methods=['POST'])
+@login_required
 def upload_coin_image(id):
     """Upload or replace image for existing coin entry"""
     try:
@@ -1033,11 +1440,9 @@ def upload_coin_image(id):
         if not file.filename:
             return jsonify({'success': False, 'error': 'No file selected'}), 400
         
-        # Delete old image if exists
+        # Delete old image (and thumbnail) if exists
         if coin.image_filename:
-            old_path = os.path.join(UPLOAD_FOLDER, coin.image_filename)
-            if os.path.exists(old_path):
-                os.remove(old_path)
+            delete_upload_file(coin.image_filename)
         
         # Save new image
         image_filename = save_upload_file(file, 'coins')
@@ -1046,19 +1451,29 @@ def upload_coin_image(id):
         
         coin.image_filename = image_filename
         db.session.commit()
+        _invalidate_coins_cache()
         
         return jsonify({'success': True})
     
     except Exception as e:
-        print(f"[ERROR] Uploading image: {e}")
+        logger.error(f"[ERROR] Uploading image: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        # create_all() skips tables that already exist, so backfill the
+        # indexes onto databases created before they were declared
+        for table in (Metal.__table__, Coin.__table__, Goldback.__table__):
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
     
-    # Start price updater
-    start_price_updater()
+    # Start price updater (skip if an external cron runs
+    # `flask update-prices` instead, e.g. under multiple workers)
+    if os.environ.get('DISABLE_PRICE_SCHEDULER', '').lower() not in ('1', 'true', 'yes'):
+        start_price_updater()
     
     from waitress import serve
-    serve(app, host='0.0.0.0', port=5000, threads=8)
+    # Enough threads that the capped SSE streams (MAX_PRICE_STREAMS of
+    # them, each pinning a thread) can never starve the regular routes
+    serve(app, host='0.0.0.0', port=5000, threads=16)
@@ -1,9 +1,48 @@
+import logging
+import msgspec
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
+import os
 import time
 
+# Handlers are configured by the app (queue-backed, so emitting a record
+# never blocks a worker thread on the stdout lock)
+logger = logging.getLogger(__name__)
+
+# Snapshot of the last fetch, shared between processes (lives in the
+# data dir next to the database so it survives container restarts)
+PRICES_FILE = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'data', 'prices.json')
+
+# Typed view of the single field we use from Yahoo's chart response.
+# msgspec decodes straight into these structs in C and skips building
+# dicts for all the ignored keys.
+class _ChartMeta(msgspec.Struct):
+    regularMarketPrice: float
+
+class _ChartResult(msgspec.Struct):
+    meta: _ChartMeta
+
+class _Chart(msgspec.Struct):
+    result: list[_ChartResult]
+
+class _ChartResponse(msgspec.Struct):
+    chart: _Chart
+
 class MetalPriceFetcher:
+    # How often the background updater refreshes prices (seconds)
+    REFRESH_INTERVAL = 1800
+
+    # How often to stat the snapshot file for external updates (seconds)
+    RELOAD_CHECK_INTERVAL = 1.0
+
+    # Floor between upstream fetches, enforced here so no caller can
+    # turn refresh requests into a hammer on Yahoo (seconds)
+    MIN_FETCH_INTERVAL = 30.0
+
     def __init__(self):
         self.symbols = {
             'gold': 'GC=F',
@@ -15,12 +54,83 @@ class MetalPriceFetcher:
             'silver': 75.00
         }
         self.last_updated = None
+        # Formatted views of last_updated, computed once per refresh
+        # instead of strftime/timestamp() on every get_prices call
+        self._last_updated_str = None
+        self._last_updated_ms = None
 
         # Headers to avoid rate limiting
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
+        # Persistent session: keep-alive reuses the TLS connection (and
+        # DNS result) across fetches instead of paying the full
+        # handshake per request; retries back off on transient errors
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3,
+                              status_forcelist=[500, 502, 503, 504])))
+
+        # Snapshot tracking: mtime of the file we last read/wrote, and
+        # when we last bothered to stat it
+        self._snapshot_mtime = None
+        self._next_reload_check = 0.0
+        self._load_snapshot()
+
+        # Monotonic time of the last upstream fetch attempt
+        self._last_fetch_ts = 0.0
+
+        # Pre-serialized get_prices() payload - the JSON only changes
+        # when a refresh lands, so it's encoded once per refresh and
+        # every request in between gets the same bytes
+        self._serialized = None
+        self._serialized_for = None
+
+    def _save_snapshot(self):
+        """Persist prices so other processes (and restarts) pick them up"""
+        try:
+            tmp_path = PRICES_FILE + '.part'
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'prices': self.prices,
+                    'last_updated': self.last_updated.isoformat() if self.last_updated else None
+                }, f)
+            os.replace(tmp_path, PRICES_FILE)
+            self._snapshot_mtime = os.stat(PRICES_FILE).st_mtime
+        except OSError as e:
+            logger.error(f"[ERROR] Saving price snapshot: {e}")
+
+    def _load_snapshot(self):
+        """Load the snapshot if another process wrote a newer one"""
+        try:
+            mtime = os.stat(PRICES_FILE).st_mtime
+            if mtime == self._snapshot_mtime:
+                return
+            with open(PRICES_FILE) as f:
+                data = json.load(f)
+            self.prices.update(data.get('prices') or {})
+            if data.get('last_updated'):
+                self._set_last_updated(datetime.fromisoformat(data['last_updated']))
+            self._snapshot_mtime = mtime
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"[ERROR] Loading price snapshot: {e}")
+
+    def _maybe_reload(self):
+        """Cheap periodic check for snapshots written by another process
+
+        Throttled to one stat per RELOAD_CHECK_INTERVAL so per-row
+        get_price calls during a render don't each hit the filesystem.
+        """
+        now = time.monotonic()
+        if now >= self._next_reload_check:
+            self._next_reload_check = now + self.RELOAD_CHECK_INTERVAL
+            self._load_snapshot()
+
     def fetch_price(self, symbol):
         try:
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
@@ -30,48 +140,96 @@ class MetalPriceFetcher:
             }
 
             # 3 second timeout to prevent blocking
-            response = requests.get(url, params=params, headers=self.headers, timeout=3)
+            response = self.session.get(url, params=params, timeout=3)
             
-            # If rate limited, return None to use cached price
-            if response.status_code == 429:
-                print(f"[ALERT] Rate limited for {symbol}, using cached price")
+            # Anything but 200 (rate limit, upstream error) means keep
+            # the cached price - one status check covers them all
+            if response.status_code != 200:
+                logger.warning(f"[ALERT] HTTP {response.status_code} for {symbol}, using cached price")
                 return None
 
-            response.raise_for_status()
-
-            data = response.json()
-
-            chart_data = data['chart']['result'][0]
-            current_price = chart_data['meta']['regularMarketPrice']
+            data = msgspec.json.decode(response.content, type=_ChartResponse)
+            current_price = data.chart.result[0].meta.regularMarketPrice
 
             return round(current_price, 2)
 
         except Exception as e:
-            print(f"[ERROR] Fetching {symbol}: {e}")
+            logger.error(f"[ERROR] Fetching {symbol}: {e}")
             return None
 
     def fetch_all_prices(self):
-        for metal, symbol in self.symbols.items():
-            price = self.fetch_price(symbol)
+        # Last line of defense against refresh hammering: whatever path
+        # got here (scheduler nudge, CLI, direct call), fetches closer
+        # together than the floor just serve the cached prices. Stamped
+        # at attempt time so failures can't be retried in a tight loop.
+        now = time.monotonic()
+        if now - self._last_fetch_ts < self.MIN_FETCH_INTERVAL:
+            return self.prices
+        self._last_fetch_ts = now
+
+        # Fetch all symbols concurrently - the calls are pure network
+        # wait, so total time is one round trip instead of a serial
+        # RTT + sleep per symbol
+        with ThreadPoolExecutor(max_workers=len(self.symbols)) as executor:
+            results = dict(zip(self.symbols,
+                               executor.map(self.fetch_price, self.symbols.values())))
+
+        for metal, price in results.items():
             if price:
                 self.prices[metal] = price
-                print(f"{metal.capitalize()}: ${price}")
+                logger.info(f"{metal.capitalize()}: ${price}")
             else:
-                print(f"{metal.capitalize()}: ${self.prices.get(metal, 0.00)} (cached)")
-
-            # Avoid rate limiting
-            time.sleep(0.5)
+                logger.info(f"{metal.capitalize()}: ${self.prices.get(metal, 0.00)} (cached)")
 
-        self.last_updated = datetime.now()
+        self._set_last_updated(datetime.now())
+        self._save_snapshot()
         return self.prices
 
+    def _set_last_updated(self, when):
+        """Record a refresh time plus its formatted views in one place"""
+        self.last_updated = when
+        self._last_updated_str = when.strftime('%Y-%m-%d %H:%M:%S')
+        self._last_updated_ms = int(when.timestamp() * 1000)
+
     def get_prices(self):
+        self._maybe_reload()
+        gold = self.prices.get('gold')
+        silver = self.prices.get('silver')
+        # Goldback rate: (gold / 1000) × 2
+        gbrate = round(gold / 1000.0 * 2.0, 2) if gold else None
         return {
-            'prices': self.prices,
-            'last_updated': self.last_updated.strftime('%Y-%m-%d %H:%M:%S') if self.last_updated else None
+            'prices': {
+                'gold': gold,
+                'silver': silver,
+                'gbrate': gbrate,
+                # Pre-formatted once here instead of in every client
+                'gold_fmt': f'${gold:.2f}' if gold else None,
+                'silver_fmt': f'${silver:.2f}' if silver else None,
+                'gbrate_fmt': self._format_rate(gbrate) if gbrate else None
+            },
+            'last_updated': self._last_updated_str,
+            # Epoch ms so clients can diff/parse without string handling
+            'last_updated_ms': self._last_updated_ms,
+            # Declared cadence - lets clients schedule polls to match
+            'refresh_interval_ms': self.REFRESH_INTERVAL * 1000
         }
 
+    def get_serialized(self):
+        """The get_prices() payload as JSON bytes, encoded once per refresh"""
+        self._maybe_reload()
+        if self._serialized is None or self._serialized_for != self.last_updated:
+            self._serialized = msgspec.json.encode(self.get_prices())
+            self._serialized_for = self.last_updated
+        return self._serialized
+
+    @staticmethod
+    def _format_rate(value):
+        """Format with max 2 decimals, trimming trailing zeros (matches the UI)"""
+        formatted = f'{value:.2f}'.rstrip('0').rstrip('.')
+        return f'${formatted}'
+
     def get_price(self, metal):
+        self._maybe_reload()
         return self.prices.get(metal.lower())
 
 # Global price fetcher instance
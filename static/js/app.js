@@ -1,40 +1,19 @@
 // Shared JavaScript functionality for all pages
 
-// Fetch and update metal prices
-function updateMetalPrices(forceRefresh = false) {
-    const url = forceRefresh ? '/api/prices?refresh=true' : '/api/prices';
-    fetch(url)
-        .then(response => response.json())
+// Fetch and update metal prices (read-only path)
+function updateMetalPrices() {
+    // Fetches revalidate with If-None-Match and get an empty 304 when
+    // nothing changed
+    return fetch('/api/prices')
+        .then(response => {
+            if (response.status === 304) {
+                return null; // Prices unchanged - skip parse and DOM writes
+            }
+            return response.json();
+        })
         .then(data => {
-            if (data.prices) {
-                // Update gold price
-                const goldEl = document.getElementById('goldPrice');
-                if (goldEl && data.prices.gold) {
-                    goldEl.textContent = '$' + data.prices.gold.toFixed(2);
-                }
-                
-                // Update silver price
-                const silverEl = document.getElementById('silverPrice');
-                if (silverEl && data.prices.silver) {
-                    silverEl.textContent = '$' + data.prices.silver.toFixed(2);
-                }
-                
-                // Calculate and update Goldback rate
-                // Formula: (gold_price / 1000) × 2
-                const gbRateEl = document.getElementById('goldbackRate');
-                if (gbRateEl && data.prices.gold) {
-                    const gbRate = (data.prices.gold / 1000.0) * 2.0;
-                    // Format with max 2 decimals, trim trailing zeros
-                    const formatted = gbRate.toFixed(2).replace(/\.?0+$/, '');
-                    gbRateEl.textContent = '$' + formatted;
-                }
-                
-                // Update timestamp in widget header (just time, no "Updated:")
-                const timestampEl = document.getElementById('widgetTimestamp');
-                if (timestampEl && data.last_updated) {
-                    const date = new Date(data.last_updated);
-                    timestampEl.textContent = date.toLocaleTimeString();
-                }
+            if (data) {
+                publishPrices(data);
             }
         })
         .catch(error => {
@@ -42,28 +21,342 @@ function updateMetalPrices(forceRefresh = false) {
         });
 }
 
+// Force an upstream refresh. Concurrent callers share one in-flight
+// request, and the server rate-limits how often the upstream fetch
+// actually runs.
+let refreshPromise = null;
+function forcePriceRefresh() {
+    if (refreshPromise) {
+        return refreshPromise;
+    }
+    refreshPromise = fetch('/api/prices/refresh', {method: 'POST'})
+        .then(response => response.json())
+        .then(publishPrices)
+        .catch(error => {
+            console.error('Error refreshing metal prices:', error);
+        })
+        .finally(() => {
+            refreshPromise = null;
+        });
+    return refreshPromise;
+}
+
+// Share price payloads across open tabs so only one tab needs to
+// hold a connection to the server
+const priceChannel = ('BroadcastChannel' in window) ? new BroadcastChannel('prices') : null;
+
+// Apply a payload locally and rebroadcast it to the other tabs
+function publishPrices(data) {
+    applyPrices(data);
+    if (priceChannel) {
+        priceChannel.postMessage(data);
+    }
+}
+
+// Strips a trailing ".00"/".50"-style zero run - compiled once, not per tick
+const TRAIL_ZEROS = /\.?0+$/;
+
+// Reusable time formatter - building one per toLocaleTimeString() call
+// is surprisingly expensive (ICU locale lookup each time)
+const TIME_FMT = new Intl.DateTimeFormat(undefined, {
+    hour: 'numeric', minute: '2-digit', second: '2-digit'
+});
+
+// Price widget elements, resolved once at DOMContentLoaded
+let priceEls = null;
+
+// Coalesce overlapping updates (e.g. manual refresh mid-stream) into
+// a single DOM write pass per animation frame
+let latestPrices = null;
+let rafPending = false;
+
+// Timestamp of the last payload we applied - used to spot real changes
+let lastPriceUpdate = null;
+
+// Pages whose server-rendered values (current value, gain/loss) go
+// stale when prices move. They get a full reload: the list pages bind
+// their edit/search/upload handlers to specific nodes at load time, so
+// swapping content in place would silently orphan all of them.
+const PRICE_SENSITIVE_PAGES = new Set(['/', '/dashboard', '/metals', '/coins', '/goldbacks']);
+
+// Refresh the current page's server-rendered tables and stats
+function reloadPageData() {
+    if (!PRICE_SENSITIVE_PAGES.has(window.location.pathname)) {
+        return;
+    }
+    // Never yank the page out from under an in-progress edit - the
+    // list pages mark cells with .editing while edit mode is active
+    if (document.querySelector('.editing')) {
+        return;
+    }
+    window.location.reload();
+}
+
+// Update the price widgets from an /api/prices payload
+function applyPrices(data) {
+    if (!data.prices) {
+        return;
+    }
+
+    // Prefer the numeric epoch-ms stamp: an integer compare instead of
+    // a string one
+    const stamp = data.last_updated_ms != null ? data.last_updated_ms : data.last_updated;
+
+    // Same payload we already rendered - skip the DOM work entirely
+    if (stamp && stamp === lastPriceUpdate) {
+        return;
+    }
+
+    // Prices changed since the last payload - server-rendered values
+    // (current value, gain/loss) on this page are now stale
+    if (lastPriceUpdate && stamp) {
+        reloadPageData();
+    }
+    if (stamp) {
+        lastPriceUpdate = stamp;
+    }
+
+    latestPrices = data;
+    if (!rafPending) {
+        rafPending = true;
+        requestAnimationFrame(() => {
+            rafPending = false;
+            writePrices(latestPrices, priceEls);
+        });
+    }
+}
+
+// Last string written to each widget - skip the DOM write (and the
+// style recalc it triggers) when the formatted value hasn't changed
+const lastFormatted = {gold: null, silver: null, gbRate: null, ts: null, tsRaw: null};
+
+// A usable price: present and a finite number. Truthiness checks would
+// treat a legitimate 0 as missing and leave stale text behind, and
+// NaN/Infinity must never reach the DOM.
+function isPrice(value) {
+    return typeof value === 'number' && isFinite(value);
+}
+
+function setIfChanged(el, key, text) {
+    if (lastFormatted[key] !== text) {
+        lastFormatted[key] = text;
+        el.textContent = text;
+    }
+}
+
+// The actual DOM writes - runs at most once per frame
+function writePrices(data, els) {
+    if (!els) {
+        return;
+    }
+
+    // Update gold price - the server pre-formats the strings so every
+    // client skips the toFixed/regex work; fall back if absent
+    if (els.gold && isPrice(data.prices.gold)) {
+        setIfChanged(els.gold, 'gold',
+            data.prices.gold_fmt || ('$' + data.prices.gold.toFixed(2)));
+    }
+
+    // Update silver price
+    if (els.silver && isPrice(data.prices.silver)) {
+        setIfChanged(els.silver, 'silver',
+            data.prices.silver_fmt || ('$' + data.prices.silver.toFixed(2)));
+    }
+
+    // Update Goldback rate
+    // Formula: (gold_price / 1000) × 2
+    if (els.gbRate && isPrice(data.prices.gold)) {
+        let text = data.prices.gbrate_fmt;
+        if (!text) {
+            const gbRate = (data.prices.gold / 1000.0) * 2.0;
+            // Format with max 2 decimals, trim trailing zeros
+            text = '$' + gbRate.toFixed(2).replace(TRAIL_ZEROS, '');
+        }
+        setIfChanged(els.gbRate, 'gbRate', text);
+    }
+
+    // Update timestamp in widget header (just time, no "Updated:")
+    // Only parse and format the date when the raw value actually changed;
+    // new Date(ms) also skips the ISO string parse
+    const rawTs = data.last_updated_ms != null ? data.last_updated_ms : data.last_updated;
+    if (els.ts && rawTs && lastFormatted.tsRaw !== rawTs) {
+        lastFormatted.tsRaw = rawTs;
+        setIfChanged(els.ts, 'ts', TIME_FMT.format(new Date(rawTs)));
+    }
+}
+
+// Fallback poller for when SSE is unavailable: a self-scheduling
+// timeout chain that only re-arms after the previous fetch settles,
+// so requests can never overlap or pile up in a throttled tab
+let polling = false;
+let pollTimer = null;
+
+// Schedule the next poll just after the server's next scheduled
+// refresh (declared in the payload), with jitter so clients don't
+// align; fall back to 5 minutes when we have no payload yet
+function nextPollDelay() {
+    const d = latestPrices;
+    if (d && d.refresh_interval_ms && d.last_updated_ms) {
+        const untilNext = d.last_updated_ms + d.refresh_interval_ms - Date.now();
+        return Math.min(Math.max(untilNext, 5000) + Math.random() * 2000,
+                        d.refresh_interval_ms);
+    }
+    return 300000;
+}
+
+function startPollingFallback() {
+    if (polling) {
+        return;
+    }
+    polling = true;
+    const poll = () => {
+        if (!polling) {
+            return;
+        }
+        pollTimer = setTimeout(() => {
+            updateMetalPrices().finally(poll);
+        }, nextPollDelay());
+    };
+    updateMetalPrices().finally(poll);
+}
+
+function stopPollingFallback() {
+    polling = false;
+    if (pollTimer) {
+        clearTimeout(pollTimer);
+        pollTimer = null;
+    }
+}
+
+// Subscribe to server-pushed price updates (sent only when the cache refreshes)
+let streamErrors = 0;
+function startPriceStream() {
+    const es = new EventSource('/api/prices/stream');
+    es.onmessage = (e) => publishPrices(JSON.parse(e.data));
+    es.onopen = () => { streamErrors = 0; };
+    es.onerror = () => {
+        // EventSource reconnects on its own; give up if it keeps failing
+        // (e.g. session expired and the stream now redirects to login)
+        streamErrors++;
+        if (streamErrors >= 5) {
+            es.close();
+            startPollingFallback();
+        }
+    };
+    return es;
+}
+
+// Stream lifecycle - only one stream per tab, and none while hidden
+let activeStream = null;
+let releaseLeadership = null;
+let seekingLeadership = false;
+
+function startStream() {
+    if (typeof EventSource === 'undefined') {
+        startPollingFallback();
+        return;
+    }
+    if (!activeStream) {
+        activeStream = startPriceStream();
+    }
+}
+
+function stopStream() {
+    stopPollingFallback();
+    if (activeStream) {
+        activeStream.close();
+        activeStream = null;
+    }
+    // Release the leader lock so a visible tab can take over
+    if (releaseLeadership) {
+        releaseLeadership();
+        releaseLeadership = null;
+    }
+}
+
+// Ask for the leader lock; stream while we hold it. Resolving the
+// returned promise (in stopStream) releases leadership to another tab.
+function acquireLeadership() {
+    if (seekingLeadership || activeStream) {
+        return;
+    }
+    seekingLeadership = true;
+    navigator.locks.request('price-stream-leader', () => {
+        seekingLeadership = false;
+        if (document.hidden) {
+            return; // Went to background while waiting - pass the lock on
+        }
+        startStream();
+        return new Promise(resolve => {
+            releaseLeadership = resolve;
+        });
+    });
+}
+
+// Elect one tab to hold the SSE connection; the rest just listen on
+// the broadcast channel. Hidden tabs drop their stream (and the
+// leader lock) entirely - no connection, no work while invisible.
+function startPriceUpdates() {
+    // Every tab fetches once up front, leader or not - a tab opened
+    // mid-interval must not sit on placeholders until the next push,
+    // and the ETag/304 path makes the extra request nearly free
+    updateMetalPrices();
+    if (priceChannel && navigator.locks) {
+        priceChannel.onmessage = (e) => applyPrices(e.data);
+        if (!document.hidden) {
+            acquireLeadership();
+        }
+        document.addEventListener('visibilitychange', () => {
+            document.hidden ? stopStream() : acquireLeadership();
+        });
+    } else {
+        // No cross-tab coordination available - each tab streams itself,
+        // but still pauses while hidden
+        if (!document.hidden) {
+            startStream();
+        }
+        document.addEventListener('visibilitychange', () => {
+            document.hidden ? stopStream() : startStream();
+        });
+    }
+}
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
-    // Load metal prices
-    updateMetalPrices();
-    
-    // Update prices every 30 minutes on the frontend
-    setInterval(updateMetalPrices, 300000);
-    
-    // Add refresh button handler
+    // Look up the widget elements once; every update reuses these
+    priceEls = {
+        gold: document.getElementById('goldPrice'),
+        silver: document.getElementById('silverPrice'),
+        gbRate: document.getElementById('goldbackRate'),
+        ts: document.getElementById('widgetTimestamp')
+    };
+
+    // Server pushes prices over SSE; no polling needed
+    startPriceUpdates();
+
+    // Add refresh button handler - rapid clicks collapse into one request
     const refreshBtn = document.getElementById('refreshPrices');
     if (refreshBtn) {
+        let refreshInFlight = false;
         refreshBtn.addEventListener('click', function() {
-            // Add spinning animation
+            if (refreshInFlight) {
+                return;
+            }
+            refreshInFlight = true;
+            this.disabled = true;
+
+            // Add spinning animation; let the rendering engine report
+            // when it finishes instead of guessing the duration with a timer
             this.classList.add('spinning');
-            
-            // Update prices with force refresh
-            updateMetalPrices(true);
-            
-            // Remove spinning animation after it completes
-            setTimeout(() => {
+            this.addEventListener('animationend', () => {
                 this.classList.remove('spinning');
-            }, 600);
+            }, {once: true});
+
+            // Update prices with force refresh
+            forcePriceRefresh().finally(() => {
+                refreshInFlight = false;
+                this.disabled = false;
+            });
         });
     }
 });
@@ -72,7 +365,7 @@ document.addEventListener('DOMContentLoaded', function() {
 // Format number - remove .00 if no decimals needed
 function formatNumber(value) {
     const num = parseFloat(value);
-    if (num === Math.floor(num)) {
+    if (Number.isInteger(num)) {
         return num.toString(); // No decimals needed
     }
     return num.toFixed(2); // Show 2 decimals